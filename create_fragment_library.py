@@ -1348,41 +1348,20 @@ def run_clash_detection(data, directory, bb_multiplier, sc_multiplier, script_pa
     def write_clash_detection_cmd(pose1, pose2, bb_multiplier, sc_multiplier, script_path, directory, prefix):
         cmd = f"{os.path.join(PROTFLOW_ENV, 'python')} {script_path} --pose1 {pose1} --pose2 {pose2} --working_dir {directory} --bb_multiplier {bb_multiplier} --sc_multiplier {sc_multiplier} --output_prefix {prefix}"
         return cmd
-    def generate_valid_combinations_parallel(n_sets, compat_maps, set_lengths):
-        compat_entries = []
-        for i in range(len(set_lengths)):
-            for j in range(i+1, len(set_lengths)):
-                for idx1, submap in compat_maps[i][j].items():
-                    for idx2 in submap:
-                        compat_entries.append((i, j, idx1, idx2))
+    def generate_valid_combinations_parallel(n_sets, compat_pairs, set_lengths):
+        # stack (set1, set2, idx1, idx2) rows per set pair in one vectorized pass instead of building tuples
+        compat_blocks = []
+        for i in range(n_sets):
+            for j in range(i+1, n_sets):
+                pairs = compat_pairs[(i, j)]
+                block = np.empty((len(pairs), 4), dtype=np.uint32)
+                block[:, 0] = i
+                block[:, 1] = j
+                block[:, 2:] = pairs
+                compat_blocks.append(block)
+        compat_entries = np.concatenate(compat_blocks) if compat_blocks else np.empty((0, 4), dtype=np.uint32)
         valid_combo_path = run_validator_to_file(set_lengths, compat_entries)
         return valid_combo_path
-    def generate_valid_combinations(n_sets, compat_maps, set_lengths):
-        valid_combos = []
-
-        def backtrack(current_indices, depth):
-            if depth == n_sets:
-                valid_combos.append(tuple(current_indices))
-                return
-
-            for idx in range(set_lengths[depth]):
-                # Check compatibility of this new index with all previous ones
-                is_valid = True
-                for prev_set in range(depth):
-                    prev_idx = current_indices[prev_set]
-                    # Make sure there's an entry
-                    if prev_idx not in compat_maps[prev_set][depth]:
-                        is_valid = False
-                        break
-                    if idx not in compat_maps[prev_set][depth][prev_idx]:
-                        is_valid = False
-                        break
-                if is_valid:
-                    backtrack(current_indices + [idx], depth + 1)
-
-        backtrack([], 0)
-        return valid_combos
-
     in_files = []
     in_dfs = []
     for pose, df in data.groupby('poses', sort=False):
@@ -1408,8 +1387,8 @@ def run_clash_detection(data, directory, bb_multiplier, sc_multiplier, script_pa
 
     jobstarter.start(cmds=cmds, jobname="clash_detection", wait=True, output_path=directory) # distribute clash detection to cluster
 
-    # Build compatibility maps using fast filtering (no row iteration)
-    compat_maps = [[None] * n_sets for _ in range(n_sets)]
+    # Collect non-clashing index pairs per set pair using fast filtering (no row iteration)
+    compat_pairs = {}
 
     log_and_print("Importing results...")
     # import results
@@ -1421,12 +1400,7 @@ def run_clash_detection(data, directory, bb_multiplier, sc_multiplier, script_pa
         clash_dfs.append(clash_df)
         filtered_df = clash_df[clash_df["clash"] == False]
 
-        # Group each pose1_index by its non-clashing pose2_index set
-        a_to_b = filtered_df.groupby("pose1_index")["pose2_index"].agg(set).to_dict()
-        b_to_a = filtered_df.groupby("pose2_index")["pose1_index"].agg(set).to_dict()
-
-        compat_maps[i][j] = a_to_b
-        compat_maps[j][i] = b_to_a  # Optional bidirectional support
+        compat_pairs[(i, j)] = filtered_df[["pose1_index", "pose2_index"]].drop_duplicates().to_numpy(dtype=np.uint32)
 
         # analyze number of clashes
         bb_bb_clashes = clash_df["bb_bb_clash"].sum()
@@ -1443,7 +1417,7 @@ def run_clash_detection(data, directory, bb_multiplier, sc_multiplier, script_pa
     log_and_print("If number of sidechain clashes is high, this is often a result of missing covalent bonds. Otherwise, <frag_frag_sc_clash_vdw_multiplier> can be reduced.")
 
     log_and_print("Generating valid combinations...")
-    valid_combo_path = generate_valid_combinations_parallel(n_sets, compat_maps, set_lengths)
+    valid_combo_path = generate_valid_combinations_parallel(n_sets, compat_pairs, set_lengths)
 
     with open(valid_combo_path+".meta") as f:
         d = json.load(f)
@@ -1454,7 +1428,7 @@ def run_clash_detection(data, directory, bb_multiplier, sc_multiplier, script_pa
     
     # Create rotamer csv paths
     valid_combos = score_files(valid_combo_path, in_files, d["rows"], d["cols"], 1000)
-    valid_combos_len = valid_combos.len()
+    valid_combos_len = len(valid_combos)
     log_and_print(f"Scored {valid_combos_len} valid combinations")
 
     log_and_print("Extracting data for each pose...")